@@ -0,0 +1,245 @@
+"""
+The aio module houses asyncio counterparts of http.HTTPClient for issuing
+independent API calls concurrently instead of one after another:
+AsyncHTTPClient, built on aiohttp, and AsyncHTTP2Client, built on httpx,
+which multiplexes those calls over HTTP/2. It requires python 3.5+ and the
+library of the client used, so it's not imported by the package itself.
+"""
+
+import asyncio
+import base64
+import ssl
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from .api import Client
+from .http import HTTPError, NetworkError, decode_json_content
+from urllib.parse import quote
+
+
+class BaseAsyncHTTPClient(object):
+    """
+    Transport independent part of the asyncio clients: path building,
+    return value parsing and the concurrent helpers. Subclasses provide the
+    session handling (_get_session, _send and close). All calls of a client
+    share one session, which must be used from a single event loop::
+
+        async with AsyncHTTPClient('localhost:15672', 'guest', 'guest') as c:
+            overview, queues = await c.get_many([Client.urls['overview'],
+                                                 Client.urls['all_queues']])
+
+    """
+
+    def __init__(self, api_url, uname, passwd, timeout=5, scheme='http',
+                 verify=True, cert=None, limit=16):
+        """
+        :param string api_url: The base URL for the broker API.
+        :param string uname: Username credential used to authenticate.
+        :param string passwd: Password used to authenticate w/ REST API
+        :param int timeout: Integer number of seconds to wait for each call.
+        :param string scheme: HTTP scheme used to connect
+        :param string verify: Path to CA certificate bundle (False to disable)
+        :param string cert: Path to client certificate
+        :param int limit: Maximum number of simultaneous connections.
+
+        """
+        self.timeout = timeout
+        self.base_url = '%s://%s/api/' % (scheme, api_url.rstrip('/'))
+        self.verify = verify
+        self.cert = cert
+        self.limit = limit
+        self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _ssl_context(self):
+        if self.verify is True and not self.cert:
+            return None
+        if self.verify is False and not self.cert:
+            return False
+
+        cafile = self.verify if not isinstance(self.verify, bool) else None
+        context = ssl.create_default_context(cafile=cafile)
+        if self.verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        if isinstance(self.cert, tuple):
+            context.load_cert_chain(*self.cert)
+        elif self.cert:
+            context.load_cert_chain(self.cert)
+        return context
+
+    async def close(self):
+        """
+        Close the underlying session and its connections.
+
+        """
+        raise NotImplementedError
+
+    async def _send(self, method, url, body, headers, params):
+        """
+        Send the request, returning (status code, raw body bytes).
+        """
+        raise NotImplementedError
+
+    async def do_call(self, path, method, body=None, headers=None,
+                      params=None):
+        """
+        Send an HTTP request to the REST API. Behaves like
+        http.HTTPClient.do_call, but has to be awaited.
+
+        :param string path: A URL
+        :param string method: The HTTP method (GET, POST, etc.) to use
+            in the request.
+        :param string body: A string representing any data to be sent in the
+            body of the HTTP request.
+        :param dictionary headers:
+            "{header-name: header-value}" dictionary.
+        :param dictionary params: query parameters
+
+        """
+        status, raw = await self._send(method, self.base_url + path, body,
+                                       headers, params)
+
+        try:
+            content = decode_json_content(raw)
+        except ValueError:
+            content = None
+
+        # 'success' HTTP status codes are 200-206
+        if status < 200 or status > 206:
+            raise HTTPError(content, status, raw.decode('utf8', 'replace'),
+                            path, body)
+        else:
+            if content is not None:
+                return content
+            else:
+                return status
+
+    async def get_many(self, paths):
+        """
+        GET several API paths concurrently.
+
+        :param list paths: paths relative to the API root, e.g. values of
+            api.Client.urls.
+        :returns: list of results, in the same order as *paths*.
+
+        """
+        return await asyncio.gather(*[self.do_call(path, 'GET')
+                                      for path in paths])
+
+    async def get_queues_detailed(self, queues):
+        """
+        Get several single queues concurrently.
+
+        :param list queues: A list of ('vhost', 'qname') tuples.
+        :returns: list of queue dicts, in the same order as *queues*.
+
+        """
+        return await self.get_many([
+            Client.urls['queues_by_name'] % (quote(vhost, ''), quote(name, ''))
+            for vhost, name in queues])
+
+
+class AsyncHTTPClient(BaseAsyncHTTPClient):
+    """
+    An asyncio client built on aiohttp.
+
+    """
+
+    def __init__(self, api_url, uname, passwd, timeout=5, scheme='http',
+                 verify=True, cert=None, limit=16):
+        if aiohttp is None:
+            raise ImportError("AsyncHTTPClient requires aiohttp")
+        super(AsyncHTTPClient, self).__init__(
+            api_url, uname, passwd, timeout=timeout, scheme=scheme,
+            verify=verify, cert=cert, limit=limit)
+        # sent as a plain header: aiohttp deprecates BasicAuth/auth=
+        credentials = ('%s:%s' % (uname, passwd)).encode('latin1')
+        self.headers = {
+            'Authorization': 'Basic ' + base64.b64encode(credentials).decode(),
+        }
+
+    def _get_session(self):
+        # The session has to be created from within the running event loop.
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit,
+                                             ssl=self._ssl_context())
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def _send(self, method, url, body, headers, params):
+        session = self._get_session()
+        try:
+            async with session.request(method, url, data=body,
+                                       headers=headers,
+                                       params=params) as resp:
+                return resp.status, await resp.read()
+        except asyncio.TimeoutError:
+            raise NetworkError("Timeout while trying to connect to RabbitMQ")
+        except aiohttp.ClientError as err:
+            raise NetworkError("Error during request %s %s" % (type(err), err))
+
+
+class AsyncHTTP2Client(BaseAsyncHTTPClient):
+    """
+    An asyncio client built on httpx, speaking HTTP/2 where the server (or a
+    proxy in front of it) supports it, so concurrent calls are multiplexed
+    over a few connections rather than one connection each.
+
+    """
+
+    def __init__(self, api_url, uname, passwd, timeout=5, scheme='http',
+                 verify=True, cert=None, limit=8):
+        if httpx is None:
+            raise ImportError("AsyncHTTP2Client requires httpx[http2]")
+        super(AsyncHTTP2Client, self).__init__(
+            api_url, uname, passwd, timeout=timeout, scheme=scheme,
+            verify=verify, cert=cert, limit=limit)
+        self.auth = (uname, passwd)
+
+    def _get_session(self):
+        if self.session is None or self.session.is_closed:
+            ssl_context = self._ssl_context()
+            self.session = httpx.AsyncClient(
+                http2=True,
+                auth=self.auth,
+                verify=True if ssl_context is None else ssl_context,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.limit))
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.aclose()
+            self.session = None
+
+    async def _send(self, method, url, body, headers, params):
+        session = self._get_session()
+        try:
+            resp = await session.request(method, url, content=body,
+                                         headers=headers, params=params)
+        except httpx.TimeoutException:
+            raise NetworkError("Timeout while trying to connect to RabbitMQ")
+        except httpx.HTTPError as err:
+            raise NetworkError("Error during request %s %s" % (type(err), err))
+        return resp.status_code, resp.content
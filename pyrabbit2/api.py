@@ -7,6 +7,7 @@ decorators used by the class.
 from . import http
 # import functools  # UNUSED
 import json
+from concurrent.futures import ThreadPoolExecutor
 try:
     # python 2.x
     from urllib import quote
@@ -84,14 +85,29 @@ class Client(object):
 
     json_headers = {"content-type": "application/json"}
 
+    # HTTPError statuses turned into our own exceptions, whatever the call.
+    # Each maps to a callable(client, path, err) building the exception, so
+    # nothing is formatted unless that status actually comes back.
+    http_errors = {
+        401: lambda client, path, err: PermissionError(
+            'Insufficient permissions to query %s with user %s :%s'
+            % (path, client.user, err)),
+    }
+
     def __init__(self, api_url, user, passwd, timeout=5, scheme='http',
-                 verify=True, cert=None):
+                 verify=True, cert=None, cache_etags=False):
         """
         :param string api_url: base url for the broker API
         :param string user: Username used to authenticate to the API.
         :param string passwd: Password used to authenticate to the API.
         :param int timeout: Integer number of seconds to wait for each call.
         :param string scheme: HTTP scheme used to make the connection
+        :param bool cache_etags: Revalidate get_overview, get_queues,
+            get_exchanges, get_connections and get_channels results with
+            ETags, returning the previous result while the broker reports
+            it unchanged. Off by default. While unchanged, the very same
+            object is returned on every call, so copy it before modifying
+            it; the last result for each path is kept in memory.
 
         Populates server attributes using passed-in parameters and
         the HTTP API's 'overview' information.
@@ -103,6 +119,7 @@ class Client(object):
         self.scheme = scheme
         self.verify = verify
         self.cert = cert
+        self.cache_etags = cache_etags
         self.http = http.HTTPClient(
             self.api_url,
             self.user,
@@ -110,25 +127,59 @@ class Client(object):
             timeout=self.timeout,
             scheme=self.scheme,
             verify=self.verify,
-            cert=self.cert
+            cert=self.cert,
+            cache_etags=self.cache_etags
         )
 
         return
 
-    def _call(self, path, method, body=None, headers=None, params=None):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the HTTP connections kept open by this client.
+        """
+        self.http.close()
+
+    def _call(self, path, method, body=None, headers=None, params=None,
+              cache=False):
         """
         Wrapper around http.do_call that transforms some HTTPError into
         our own exceptions
         """
         try:
-            resp = self.http.do_call(path, method, body, headers, params)
+            resp = self.http.do_call(path, method, body, headers, params,
+                                     cache=cache)
         except http.HTTPError as err:
-            if err.status == 401:
-                raise PermissionError('Insufficient permissions to query ' +
-                    '%s with user %s :%s' % (path, self.user, err))
+            self._handle_http_error(err, path)
             raise
         return resp
 
+    def _iter(self, path, params=None):
+        """
+        Wrapper around http.iter_items that transforms some HTTPError into
+        our own exceptions
+        """
+        try:
+            for item in self.http.iter_items(path, params):
+                yield item
+        except http.HTTPError as err:
+            self._handle_http_error(err, path)
+            raise
+
+    def _handle_http_error(self, err, path):
+        """
+        Raise our own exception for *err* if its status is listed in
+        Client.http_errors, otherwise return so the caller re-raises it.
+        """
+        handler = Client.http_errors.get(err.status)
+        if handler is not None:
+            raise handler(self, path, err)
+
     def get_shovel(self, vhost, shovel_name):
         """
         Create a shovel on a given vhost.
@@ -242,7 +293,7 @@ class Client(object):
         policy = self._call(path, 'PUT', body=body, headers=Client.json_headers)
         return policy
 
-    def is_alive(self, vhost='%2F'):
+    def is_alive(self, vhost='/'):
         """
         Uses the aliveness-test API call to determine if the
         server is alive and the vhost is active. The broker (not this code)
@@ -250,23 +301,25 @@ class Client(object):
 
         :param string vhost: There should be no real reason to ever change
             this from the default value, but it's there if you need to.
+            Pass the plain vhost name ('/', not '%2F'): it is quoted here,
+            so an already encoded name would be encoded twice.
         :returns bool: True if alive, False otherwise
-        :raises: HTTPError if *vhost* doesn't exist on the broker.
+        :raises: APIError if *vhost* doesn't exist on the broker.
 
+        Only the response status is looked at: the broker answers 200 when
+        the test passes, so the body is never decoded.
         """
-        uri = Client.urls['live_test'] % vhost
+        uri = Client.urls['live_test'] % quote(vhost, '')
 
         try:
-            resp = self._call(uri, 'GET')
+            status = self.http.do_call_status(uri, 'GET')
         except http.HTTPError as err:
             if err.status == 404:
                 raise APIError("No vhost named '%s'" % vhost)
+            self._handle_http_error(err, uri)
             raise
 
-        if resp['status'] == 'ok':
-            return True
-        else:
-            return False
+        return status == 200
 
     def get_whoami(self):
         """
@@ -291,8 +344,10 @@ class Client(object):
         some high-level message stats, and aggregate queue totals. Admin-level
         creds gets you information about the cluster node, listeners, etc.
 
+        Revalidated with ETags if cache_etags is set (see Client.__init__).
+
         """
-        overview = self._call(Client.urls['overview'], 'GET')
+        overview = self._call(Client.urls['overview'], 'GET', cache=True)
         return overview
 
     def get_nodes(self):
@@ -408,7 +463,7 @@ class Client(object):
 
         :param string username: User to set permissions for.
         """
-
+        username = quote(username, '')
         path = Client.urls['user_permissions'] % (username,)
         conns = self._call(path, 'GET')
         return conns
@@ -433,6 +488,7 @@ class Client(object):
         http://www.rabbitmq.com/admin-guide.html#access-control
         """
         vname = quote(vname, '')
+        username = quote(username, '')
         body = json.dumps({"configure": config, "read": rd, "write": wr})
         path = Client.urls['vhost_permissions'] % (vname, username)
         return self._call(path, 'PUT', body,
@@ -447,6 +503,7 @@ class Client(object):
         :param string username: User to set permissions for.
         """
         vname = quote(vname, '')
+        username = quote(username, '')
         path = Client.urls['vhost_permissions'] % (vname, username)
         return self._call(path, 'DELETE')
 
@@ -458,6 +515,7 @@ class Client(object):
         :param string username: User to set permissions for.
         """
         vname = quote(vname, '')
+        username = quote(username, '')
         path = Client.urls['vhost_permissions'] % (vname, username)
         return self._call(path, 'GET')
 
@@ -470,6 +528,8 @@ class Client(object):
         :param string vhost: A vhost to query for exchanges, or None (default),
             which triggers a query for all exchanges in all vhosts.
 
+        Revalidated with ETags if cache_etags is set (see Client.__init__).
+
         """
         if vhost:
             vhost = quote(vhost, '')
@@ -477,7 +537,7 @@ class Client(object):
         else:
             path = Client.urls['all_exchanges']
 
-        exchanges = self._call(path, 'GET')
+        exchanges = self._call(path, 'GET', cache=True)
         return exchanges
 
     def get_exchange(self, vhost, name):
@@ -598,6 +658,8 @@ class Client(object):
         :returns: A list of dicts, each representing a queue.
         :rtype: list of dicts
 
+        Revalidated with ETags if cache_etags is set (see Client.__init__).
+
         """
         if vhost:
             vhost = quote(vhost, '')
@@ -621,9 +683,28 @@ class Client(object):
                 cur_page += 1
                 num_pages = result['page_count']
         else:
-            queues = self._call(path, 'GET')
+            queues = self._call(path, 'GET', cache=True)
         return queues or list()
 
+    def iter_queues(self, vhost=None):
+        """
+        Like get_queues, but yields the queues one at a time as the response
+        is streamed in, so memory use doesn't grow with the number of queues
+        on the broker. Pattern filtering isn't supported here.
+
+        :param string vhost: The virtual host to list queues for. If This is
+                    None (the default), all queues for the broker instance
+                    are returned.
+        :returns: An iterator of dicts, each representing a queue.
+
+        """
+        if vhost:
+            vhost = quote(vhost, '')
+            path = Client.urls['queues_by_vhost'] % vhost
+        else:
+            path = Client.urls['all_queues']
+        return self._iter(path)
+
     def get_queue(self, vhost, name):
         """
         Get a single queue, which requires both vhost and name.
@@ -687,19 +768,23 @@ class Client(object):
                 depth = self.get_queue_depth(vhost, name)
                 print("\t%s: %s" % (name, depth))
 
-    def purge_queues(self, queues):
+    def purge_queues(self, queues, max_workers=8):
         """
-        Purge all messages from one or more queues.
+        Purge all messages from one or more queues. Purges are sent
+        concurrently from a pool of threads sharing the client's connections.
 
         :param list queues: A list of ('qname', 'vhost') tuples.
+        :param int max_workers: Maximum number of purges in flight at once.
         :returns: True on success
 
         """
-        for name, vhost in queues:
-            vhost = quote(vhost, '')
-            name = quote(name, '')
-            path = Client.urls['purge_queue'] % (vhost, name)
-            self._call(path, 'DELETE')
+        def purge(queue):
+            name, vhost = queue
+            return self.purge_queue(vhost, name)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # consume the results so that the first failure is raised here
+            list(executor.map(purge, queues))
         return True
 
     def purge_queue(self, vhost, name):
@@ -818,11 +903,22 @@ class Client(object):
     def get_connections(self):
         """
         :returns: list of dicts, or an empty list if there are no connections.
+
+        Revalidated with ETags if cache_etags is set (see Client.__init__).
         """
         path = Client.urls['all_connections']
-        conns = self._call(path, 'GET')
+        conns = self._call(path, 'GET', cache=True)
         return conns
 
+    def iter_connections(self):
+        """
+        Like get_connections, but yields the connections one at a time as
+        the response is streamed in.
+
+        :returns: An iterator of dicts, each representing a connection.
+        """
+        return self._iter(Client.urls['all_connections'])
+
     def get_connection(self, name):
         """
         Get a connection by name. To get the names, use get_connections.
@@ -854,11 +950,22 @@ class Client(object):
         """
         Return a list of dicts containing details about broker connections.
         :returns: list of dicts
+
+        Revalidated with ETags if cache_etags is set (see Client.__init__).
         """
         path = Client.urls['all_channels']
-        chans = self._call(path, 'GET')
+        chans = self._call(path, 'GET', cache=True)
         return chans
 
+    def iter_channels(self):
+        """
+        Like get_channels, but yields the channels one at a time as the
+        response is streamed in.
+
+        :returns: An iterator of dicts, each representing a channel.
+        """
+        return self._iter(Client.urls['all_channels'])
+
     def get_channel(self, name):
         """
         Get a channel by name. To get the names, use get_channels.
@@ -958,7 +1065,7 @@ class Client(object):
         :param string tags: Comma-separated list of tags for the user
         :returns: boolean
         """
-        path = Client.urls['users_by_name'] % username
+        path = Client.urls['users_by_name'] % quote(username, '')
         body = None
         if bool(password):
             body = json.dumps({'password': password, 'tags': tags})
@@ -975,7 +1082,7 @@ class Client(object):
 
         :param string username: Name of the user to delete from the server.
         """
-        path = Client.urls['users_by_name'] % username
+        path = Client.urls['users_by_name'] % quote(username, '')
         return self._call(path, 'DELETE')
 
     def get_definitions(self):
@@ -1,14 +1,82 @@
 
 import json
-import os
 import socket
+import sys
 import requests
 import requests.exceptions
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.connection import HTTPConnection
+
+
+def _pick_json_backend():
+    """
+    Choose the fastest JSON parser available.
+
+    :returns: (backend name, loads, loads_large) where loads_large is the
+        function used for bodies over LARGE_CONTENT_SIZE.
+
+    """
+    try:
+        # orjson parses bytes directly and is much faster than stdlib json
+        from orjson import loads
+        return 'orjson', loads, loads
+    except ImportError:
+        pass
+    try:
+        # msgspec is the next best thing; build its decoder once and reuse it
+        from msgspec.json import Decoder
+        loads = Decoder().decode
+        return 'msgspec', loads, loads
+    except ImportError:
+        pass
+
+    if sys.version_info < (3,) or sys.version_info >= (3, 6):
+        # stdlib json accepts bytes (python 2.x str, python 3.6+ bytes)
+        loads = json.loads
+    else:
+        def loads(content):
+            # python 3.4/3.5 json only parses str
+            return json.loads(content.decode('utf8'))
+    try:
+        # simdjson beats stdlib json on big documents such as queue or
+        # connection listings, though not orjson or msgspec
+        from simdjson import loads as loads_large
+    except ImportError:
+        loads_large = loads
+    return 'json', loads, loads_large
+
+
+json_backend, json_loads, json_loads_large = _pick_json_backend()
+
 try:
-    from urlparse import urljoin, urlparse, urlunparse
+    # ijson parses a response incrementally, while it's being downloaded
+    import ijson
 except ImportError:
-    from urllib.parse import urljoin, urlparse, urlunparse
+    ijson = None
+
+# Response bodies larger than this (in bytes) are parsed with json_loads_large;
+# smaller ones don't make up for the extra parser setup.
+LARGE_CONTENT_SIZE = 16 * 1024
+
+
+def decode_json_content(content):
+    """
+    Parse a JSON response body, picking the parser by body size. The bytes
+    are handed to the parser as is, without decoding them to a str first.
+
+    :param bytes content: raw response body
+    :returns: the decoded document, or None if *content* is empty
+    :raises ValueError: if *content* is not valid JSON
+
+    """
+    if not content:
+        # e.g. 204 No Content; not worth a parser error
+        return None
+    if len(content) > LARGE_CONTENT_SIZE:
+        return json_loads_large(content)
+    return json_loads(content)
+
 
 class HTTPError(Exception):
     """
@@ -23,18 +91,20 @@ class HTTPError(Exception):
         self.reason = reason
         self.path = path
         self.body = body
-        self.detail = None
 
         # Actual, useful reason for failure returned by RabbitMQ
         self.detail=None
         if content and content.get('reason'):
             self.detail = content['reason']
 
-        self.output = "%s - %s (%s) (%s) (%s)" % (self.status,
-                                             self.reason,
-                                             self.detail,
-                                             self.path,
-                                             repr(self.body))
+    @property
+    def output(self):
+        # Built on demand: callers often only check .status and move on.
+        return "%s - %s (%s) (%s) (%s)" % (self.status,
+                                           self.reason,
+                                           self.detail,
+                                           self.path,
+                                           repr(self.body))
 
     def __str__(self):
         return self.output
@@ -47,6 +117,21 @@ class NetworkError(Exception):
     pass
 
 
+class KeepAliveAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter whose pooled sockets keep urllib3's TCP_NODELAY and also
+    enable TCP keepalive, so idle connections between polls stay usable.
+
+    """
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', self.socket_options)
+        super(KeepAliveAdapter, self).init_poolmanager(*args, **kwargs)
+
+
 class HTTPClient(object):
     """
     A wrapper for requests. Abstracts away
@@ -56,7 +141,7 @@ class HTTPClient(object):
     """
 
     def __init__(self, api_url, uname, passwd, timeout=5, scheme='http',
-                 verify=True, cert=None):
+                 verify=True, cert=None, cache_etags=False):
         """
         :param string api_url: The base URL for the broker API.
         :param string uname: Username credential used to authenticate.
@@ -65,16 +150,63 @@ class HTTPClient(object):
         :param string scheme: HTTP scheme used to connect
         :param string verify: Path to CA certificate bundle (False to disable)
         :param string cert: Path to client certificate
+        :param bool cache_etags: Honour do_call's cache flag (see there).
+            Off by default, as cached results are shared between calls and
+            kept in memory for the client's lifetime.
 
         """
         self.auth = HTTPBasicAuth(uname, passwd)
         self.timeout = timeout
-        api_url = '%s://%s/api/' % (scheme, api_url)
-        self.base_url = api_url
+        # a trailing '/' on api_url would otherwise yield '//api/'
+        self.base_url = '%s://%s/api/' % (scheme, api_url.rstrip('/'))
         self.verify = verify
         self.cert = cert
 
-    def do_call(self, path, method, body=None, headers=None, params=None):
+        # One pooled session per client, so consecutive calls reuse the
+        # same keep-alive connection instead of reconnecting each time.
+        self.session = requests.Session()
+        self.session.auth = self.auth
+        adapter = KeepAliveAdapter(pool_connections=4, pool_maxsize=16,
+                                   max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        # path -> (ETag, decoded content) of the last cacheable GET
+        self.cache_etags = cache_etags
+        self.etag_cache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """
+        Close the underlying session and its pooled connections.
+
+        """
+        self.session.close()
+
+    def _request(self, path, method, body=None, headers=None, params=None,
+                 stream=False):
+        # base_url always ends with '/', and paths are relative to it
+        url = self.base_url + path
+        try:
+            # verify/cert are passed per request: set on the session they
+            # would lose to REQUESTS_CA_BUNDLE/CURL_CA_BUNDLE
+            return self.session.request(method, url, data=body,
+                                        headers=headers, timeout=self.timeout,
+                                        verify=self.verify, cert=self.cert,
+                                        params=params, stream=stream)
+        except requests.exceptions.Timeout as out:
+            raise NetworkError("Timeout while trying to connect to RabbitMQ")
+        except requests.exceptions.RequestException as err:
+            # All other requests exceptions inherit from RequestException
+            raise NetworkError("Error during request %s %s" % (type(err), err))
+
+    def do_call(self, path, method, body=None, headers=None, params=None,
+                cache=False):
         """
         Send an HTTP request to the REST API.
 
@@ -86,22 +218,25 @@ class HTTPClient(object):
         :param dictionary headers:
             "{header-name: header-value}" dictionary.
         :param dictionary params: query parameters
+        :param bool cache: If the client was created with cache_etags, and
+            this is a GET without params, remember the response's ETag and
+            send it back as If-None-Match next time; on a 304 the previously
+            decoded content is returned as is (the very same object, so
+            callers must not modify it in place).
 
         """
-        url = urljoin(self.base_url, path)
-        try:
-            resp = requests.request(method, url, data=body, headers=headers,
-                                    auth=self.auth, timeout=self.timeout,
-                                    verify=self.verify, cert=self.cert,
-                                    params=params)
-        except requests.exceptions.Timeout as out:
-            raise NetworkError("Timeout while trying to connect to RabbitMQ")
-        except requests.exceptions.RequestException as err:
-            # All other requests exceptions inherit from RequestException
-            raise NetworkError("Error during request %s %s" % (type(err), err))
+        cache = cache and self.cache_etags and method == 'GET' and not params
+        cached = self.etag_cache.get(path) if cache else None
+        if cached is not None:
+            headers = dict(headers or {})
+            headers['If-None-Match'] = cached[0]
+
+        resp = self._request(path, method, body, headers, params)
+        if cached is not None and resp.status_code == 304:
+            return cached[1]
 
         try:
-            content = resp.json()
+            content = decode_json_content(resp.content)
         except ValueError as out:
             content = None
 
@@ -109,7 +244,70 @@ class HTTPClient(object):
         if resp.status_code < 200 or resp.status_code > 206:
             raise HTTPError(content, resp.status_code, resp.text, path, body)
         else:
+            if cache and content is not None and 'ETag' in resp.headers:
+                self.etag_cache[path] = (resp.headers['ETag'], content)
             if content is not None:
                 return content
             else:
                 return resp.status_code
+
+    def do_call_status(self, path, method, headers=None, params=None):
+        """
+        Send an HTTP request to the REST API when only the response status
+        matters. On success the body is discarded without being decoded.
+
+        :param string path: A URL
+        :param string method: The HTTP method (GET, POST, etc.) to use
+            in the request.
+        :param dictionary headers:
+            "{header-name: header-value}" dictionary.
+        :param dictionary params: query parameters
+        :returns: the HTTP status code
+        :raises: HTTPError for a non-success status, as do_call does
+
+        """
+        resp = self._request(path, method, headers=headers, params=params,
+                             stream=True)
+        if resp.status_code < 200 or resp.status_code > 206:
+            try:
+                content = decode_json_content(resp.content)
+            except ValueError:
+                content = None
+            raise HTTPError(content, resp.status_code, resp.text, path)
+
+        # drain rather than close, so the connection goes back to the pool
+        resp.raw.drain_conn()
+        resp.raw.release_conn()
+        return resp.status_code
+
+    def iter_items(self, path, params=None):
+        """
+        GET a path that returns a JSON array, and yield its elements one by
+        one as the response is read, instead of holding the whole list in
+        memory. Falls back to parsing the full body if ijson isn't installed.
+
+        Being a generator, nothing is sent until the first item is requested.
+
+        :param string path: A URL
+        :param dictionary params: query parameters
+
+        """
+        resp = self._request(path, 'GET', params=params, stream=True)
+        try:
+            if resp.status_code < 200 or resp.status_code > 206:
+                try:
+                    content = decode_json_content(resp.content)
+                except ValueError:
+                    content = None
+                raise HTTPError(content, resp.status_code, resp.text, path)
+
+            if ijson is None:
+                items = decode_json_content(resp.content) or []
+            else:
+                # let urllib3 undo any gzip/deflate content-encoding
+                resp.raw.decode_content = True
+                items = ijson.items(resp.raw, 'item', use_float=True)
+            for item in items:
+                yield item
+        finally:
+            resp.close()
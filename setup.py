@@ -32,7 +32,15 @@ data that lives inside of RabbitMQ, and manipulate the resources there.""",
           "Topic :: Software Development :: Libraries :: Python Modules",
           ],
       keywords='python http amqp rabbit rabbitmq management',
-      install_requires = ['requests'],
+      install_requires = ['requests', 'futures; python_version < "3"'],
+      extras_require = {
+          'orjson': ['orjson'],
+          'msgspec': ['msgspec'],
+          'simdjson': ['pysimdjson'],
+          'aio': ['aiohttp'],
+          'http2': ['httpx[http2]'],
+          'stream': ['ijson'],
+      },
       author='Brian K. Jones, Yuri Bukatkin',
       author_email='bkjones@gmail.com, windowod@gmail.com',
       url='https://github.com/deslum/pyrabbit2',
@@ -0,0 +1,119 @@
+try:
+    import unittest2 as unittest
+except ImportError:
+    import unittest
+
+import sys
+sys.path.append('..')
+from mock import Mock
+from pyrabbit2.api import Client
+try:
+    import asyncio
+    from pyrabbit2 import aio
+except (ImportError, SyntaxError):
+    # python 2.x can't even parse the module
+    raise unittest.SkipTest('pyrabbit2.aio needs python 3.5+')
+
+
+@unittest.skipIf(aio.aiohttp is None, 'aiohttp not installed')
+class TestAsyncHTTPClient(unittest.TestCase):
+    testhost = 'localhost:15672'
+    testuser = 'guest'
+    testpass = 'guest'
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.c = aio.AsyncHTTPClient(self.testhost, self.testuser,
+                                     self.testpass)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def fake_do_call(self):
+        """
+        Replace do_call with a Mock returning already resolved futures,
+        each carrying the (path, method) it was called with.
+        """
+        def do_call(path, method):
+            future = self.loop.create_future()
+            future.set_result((path, method))
+            return future
+        self.c.do_call = Mock(side_effect=do_call)
+
+    def fake_send(self, status, raw=b''):
+        """
+        Replace _send with a Mock resolving to (status, raw).
+        """
+        future = self.loop.create_future()
+        future.set_result((status, raw))
+        self.c._send = Mock(return_value=future)
+
+    def test_client_init_sets_credentials(self):
+        self.assertEqual(self.c.headers['Authorization'],
+                         'Basic Z3Vlc3Q6Z3Vlc3Q=')
+        self.assertEqual(self.c.base_url, 'http://localhost:15672/api/')
+
+    def test_do_call_200(self):
+        self.fake_send(200, b'[{"name": "q1"}]')
+        result = self.loop.run_until_complete(self.c.do_call('queues', 'GET'))
+        self.assertEqual(result, [{'name': 'q1'}])
+        self.assertEqual(self.c._send.call_args[0][:2],
+                         ('GET', 'http://localhost:15672/api/queues'))
+
+    def test_do_call_204(self):
+        self.fake_send(204)
+        result = self.loop.run_until_complete(
+            self.c.do_call('queues/%2F/q1', 'DELETE'))
+        self.assertEqual(result, 204)
+
+    def test_do_call_404(self):
+        self.fake_send(404, b'{"error": "Object Not Found", '
+                            b'"reason": "Not Found"}')
+        with self.assertRaises(aio.HTTPError) as ctx:
+            self.loop.run_until_complete(self.c.do_call('queues/x/y', 'GET'))
+        self.assertEqual(ctx.exception.status, 404)
+        self.assertEqual(ctx.exception.detail, 'Not Found')
+
+    def test_send_timeout(self):
+        session = Mock(closed=False)
+        session.request.side_effect = asyncio.TimeoutError()
+        self.c.session = session
+        with self.assertRaises(aio.NetworkError):
+            self.loop.run_until_complete(self.c.do_call('overview', 'GET'))
+
+    def test_send_connection_error(self):
+        # nothing listens on port 1, so this goes through _get_session and a
+        # real aiohttp request
+        c = aio.AsyncHTTPClient('127.0.0.1:1', self.testuser, self.testpass)
+        try:
+            with self.assertRaises(aio.NetworkError):
+                self.loop.run_until_complete(c.do_call('overview', 'GET'))
+            self.assertEqual(c.session.headers['Authorization'],
+                             c.headers['Authorization'])
+        finally:
+            self.loop.run_until_complete(c.close())
+
+    def test_get_many(self):
+        self.fake_do_call()
+        paths = [Client.urls['overview'], Client.urls['all_queues']]
+        result = self.loop.run_until_complete(self.c.get_many(paths))
+        self.assertEqual(result, [(paths[0], 'GET'), (paths[1], 'GET')])
+
+    def test_get_queues_detailed(self):
+        self.fake_do_call()
+        result = self.loop.run_until_complete(
+            self.c.get_queues_detailed([('/', 'q1'), ('v', 'q 2')]))
+        self.assertEqual([path for path, method in result],
+                         ['queues/%2F/q1', 'queues/v/q%202'])
+
+
+@unittest.skipIf(aio.httpx is None, 'httpx not installed')
+class TestAsyncHTTP2Client(unittest.TestCase):
+    def test_client_init(self):
+        c = aio.AsyncHTTP2Client('localhost:15672', 'guest', 'guest')
+        self.assertEqual(c.auth, ('guest', 'guest'))
+        self.assertEqual(c.limit, 8)
+
+
+if __name__ == "__main__":
+    unittest.main(testRunner=unittest.TextTestRunner())
@@ -3,11 +3,33 @@ try:
 except ImportError:
     import unittest
 
+import gzip
+import io
+import socket
 import sys
 sys.path.append('..')
+import requests
+import urllib3
+from mock import patch
 from pyrabbit2 import http
 
 
+def gzipped(data):
+    # gzip.compress() is python 3.2+ only
+    buf = io.BytesIO()
+    f = gzip.GzipFile(fileobj=buf, mode='wb')
+    f.write(data)
+    f.close()
+    return buf.getvalue()
+
+
+def importable(name):
+    try:
+        __import__(name)
+    except ImportError:
+        return False
+    return True
+
 
 class TestHTTPClient(unittest.TestCase):
     """
@@ -36,5 +58,187 @@ class TestHTTPClient(unittest.TestCase):
         c = http.HTTPClient(self.testhost, self.testuser, self.testpass, 1)
         self.assertEqual(c.timeout, 1)
 
+    def test_client_init_sets_base_url(self):
+        c = http.HTTPClient(self.testhost + '/', self.testuser, self.testpass)
+        self.assertEqual(c.base_url, 'http://localhost:15672/api/')
+
+    def test_client_init_sets_session(self):
+        self.assertIs(self.c.session.auth, self.c.auth)
+
+    def test_verify_not_overridden_by_environment(self):
+        c = http.HTTPClient(self.testhost, self.testuser, self.testpass,
+                            scheme='https', verify=False)
+        with patch.dict('os.environ', {'REQUESTS_CA_BUNDLE': '/tmp/ca.pem',
+                                       'CURL_CA_BUNDLE': '/tmp/ca.pem'}):
+            with patch('requests.adapters.HTTPAdapter.send') as send:
+                resp = requests.Response()
+                resp._content = b'[]'
+                resp.status_code = 200
+                send.return_value = resp
+                c.do_call('queues', 'GET')
+                self.assertIs(send.call_args[1]['verify'], False)
+
+    def test_client_close(self):
+        with patch('requests.Session.close') as close:
+            with http.HTTPClient(self.testhost, self.testuser,
+                                 self.testpass) as c:
+                self.assertFalse(close.called)
+        close.assert_called_once_with()
+
+    def test_client_session_socket_options(self):
+        adapter = self.c.session.get_adapter('http://localhost:15672/api/')
+        options = adapter.poolmanager.connection_pool_kw['socket_options']
+        self.assertIn((socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), options)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+
+    def test_client_session_accepts_gzip(self):
+        self.assertIn('gzip', self.c.session.headers['Accept-Encoding'])
+
+    def test_decode_json_content(self):
+        small = b'{"name": "q1", "messages": 4}'
+        self.assertEqual(http.decode_json_content(small),
+                         {'name': 'q1', 'messages': 4})
+        large = b'[' + b','.join([small] * 1000) + b']'
+        self.assertGreater(len(large), http.LARGE_CONTENT_SIZE)
+        queues = http.decode_json_content(large)
+        self.assertEqual(len(queues), 1000)
+        self.assertEqual(queues[0]['messages'], 4)
+        self.assertIsNone(http.decode_json_content(b''))
+
+    @unittest.skipUnless(importable('orjson'), 'orjson not installed')
+    def test_json_backend_orjson(self):
+        backend, loads, loads_large = http._pick_json_backend()
+        self.assertEqual(backend, 'orjson')
+        self.assertIs(loads_large, loads)
+
+    @unittest.skipUnless(importable('msgspec'), 'msgspec not installed')
+    def test_json_backend_msgspec(self):
+        with patch.dict(sys.modules, {'orjson': None}):
+            backend, loads, loads_large = http._pick_json_backend()
+        self.assertEqual(backend, 'msgspec')
+        self.assertIs(loads_large, loads)
+
+    @unittest.skipUnless(importable('simdjson'), 'pysimdjson not installed')
+    def test_json_backend_stdlib_with_simdjson(self):
+        import simdjson
+        blocked = {'orjson': None, 'msgspec': None, 'msgspec.json': None}
+        with patch.dict(sys.modules, blocked):
+            backend, loads, loads_large = http._pick_json_backend()
+        self.assertEqual(backend, 'json')
+        self.assertIs(loads_large, simdjson.loads)
+
+    def test_json_backend_stdlib(self):
+        blocked = {'orjson': None, 'msgspec': None, 'msgspec.json': None,
+                   'simdjson': None}
+        with patch.dict(sys.modules, blocked):
+            backend, loads, loads_large = http._pick_json_backend()
+        self.assertEqual(backend, 'json')
+        self.assertIs(loads_large, loads)
+        self.assertEqual(loads(b'{"a": 1}'), {'a': 1})
+
+    def test_do_call_builds_url(self):
+        with patch.object(self.c.session, 'request') as req:
+            resp = requests.Response()
+            resp._content = b'[]'
+            resp.status_code = 200
+            req.return_value = resp
+            self.assertEqual(self.c.do_call('queues/%2F', 'GET'), [])
+            self.assertEqual(req.call_args[0],
+                             ('GET', 'http://localhost:15672/api/queues/%2F'))
+
+    def test_do_call_etag_cache_off_by_default(self):
+        with patch.object(self.c.session, 'request') as req:
+            resp = requests.Response()
+            resp._content = b'{"messages": 1}'
+            resp.status_code = 200
+            resp.headers['ETag'] = '"abc"'
+            req.return_value = resp
+
+            self.c.do_call('overview', 'GET', cache=True)
+            self.c.do_call('overview', 'GET', cache=True)
+            self.assertEqual(self.c.etag_cache, {})
+            self.assertIsNone(req.call_args[1]['headers'])
+
+    def test_do_call_etag_cache(self):
+        self.c = http.HTTPClient(self.testhost, self.testuser, self.testpass,
+                                 cache_etags=True)
+        with patch.object(self.c.session, 'request') as req:
+            first = requests.Response()
+            first._content = b'{"messages": 1}'
+            first.status_code = 200
+            first.headers['ETag'] = '"abc"'
+            unchanged = requests.Response()
+            unchanged._content = b''
+            unchanged.status_code = 304
+            req.side_effect = [first, unchanged]
+
+            content = self.c.do_call('overview', 'GET', cache=True)
+            self.assertEqual(content, {'messages': 1})
+            self.assertIs(self.c.do_call('overview', 'GET', cache=True),
+                          content)
+            self.assertEqual(req.call_args[1]['headers'],
+                             {'If-None-Match': '"abc"'})
+
+    def test_http_error_str(self):
+        err = http.HTTPError({'reason': 'not found'}, 404, 'Not Found',
+                             'queues/%2F/q1')
+        self.assertEqual(err.detail, 'not found')
+        self.assertEqual(str(err),
+                         "404 - Not Found (not found) (queues/%2F/q1) (None)")
+
+    def test_iter_items(self):
+        with patch.object(self.c.session, 'request') as req:
+            resp = requests.Response()
+            resp.raw = urllib3.HTTPResponse(
+                io.BytesIO(b'[{"name": "q1"}, {"name": "q2"}]'),
+                preload_content=False)
+            resp.status_code = 200
+            req.return_value = resp
+            names = [q['name'] for q in self.c.iter_items('queues')]
+            self.assertEqual(names, ['q1', 'q2'])
+            self.assertTrue(req.call_args[1]['stream'])
+
+    def test_iter_items_gzip(self):
+        with patch.object(self.c.session, 'request') as req:
+            resp = requests.Response()
+            resp.raw = urllib3.HTTPResponse(
+                io.BytesIO(gzipped(b'[{"name": "q1"}]')),
+                headers={'Content-Encoding': 'gzip'},
+                preload_content=False, decode_content=False)
+            resp.status_code = 200
+            req.return_value = resp
+            self.assertEqual(list(self.c.iter_items('queues')),
+                             [{'name': 'q1'}])
+
+    def test_do_call_status(self):
+        with patch.object(self.c.session, 'request') as req:
+            body = b'{"status": "ok"}'
+            resp = requests.Response()
+            resp.raw = urllib3.HTTPResponse(io.BytesIO(body),
+                                            preload_content=False)
+            resp.status_code = 200
+            req.return_value = resp
+            self.assertEqual(self.c.do_call_status('aliveness-test/%2F',
+                                                   'GET'), 200)
+            self.assertTrue(req.call_args[1]['stream'])
+            # drained, so the connection can go back to the pool
+            self.assertEqual(resp.raw.tell(), len(body))
+            self.assertFalse(resp._content_consumed)
+
+    def test_do_call_status_error(self):
+        with patch.object(self.c.session, 'request') as req:
+            resp = requests.Response()
+            resp.raw = urllib3.HTTPResponse(
+                io.BytesIO(b'{"error": "Object Not Found", '
+                           b'"reason": "Not Found"}'),
+                preload_content=False)
+            resp.status_code = 404
+            req.return_value = resp
+            with self.assertRaises(http.HTTPError) as ctx:
+                self.c.do_call_status('aliveness-test/nope', 'GET')
+            self.assertEqual(ctx.exception.status, 404)
+            self.assertEqual(ctx.exception.detail, 'Not Found')
+            self.assertEqual(ctx.exception.path, 'aliveness-test/nope')
+
 if __name__ == "__main__":
     unittest.main(testRunner=unittest.TextTestRunner())
@@ -30,10 +30,38 @@ class TestClient(unittest.TestCase):
         self.assertIsInstance(self.client, pyrabbit2.api.Client)
         self.assertEqual(self.client.api_url, host_and_port)
 
+    def test_client_close(self):
+        with pyrabbit2.api.Client(host_and_port, user, password) as client:
+            client.http.close = Mock()
+        client.http.close.assert_called_once_with()
+
+    def test_server_init_cache_etags(self):
+        self.assertFalse(self.client.http.cache_etags)
+        client = pyrabbit2.api.Client(host_and_port, user, password,
+                                      cache_etags=True)
+        self.assertTrue(client.http.cache_etags)
+
     def test_server_is_alive_default_vhost(self):
-        response = {'status': 'ok'}
-        self.client.http.do_call = Mock(return_value=response)
+        self.client.http.do_call_status = Mock(return_value=200)
         self.assertTrue(self.client.is_alive())
+        self.assertEqual(self.client.http.do_call_status.call_args[0][0],
+                         'aliveness-test/%2F')
+
+    def test_server_is_alive_quotes_vhost(self):
+        self.client.http.do_call_status = Mock(return_value=200)
+        self.client.is_alive('%2F')
+        self.assertEqual(self.client.http.do_call_status.call_args[0][0],
+                         'aliveness-test/%252F')
+
+    def test_is_alive_no_vhost(self):
+        err = pyrabbit2.http.HTTPError(None, 404, 'Not Found', 'aliveness-test')
+        self.client.http.do_call_status = Mock(side_effect=err)
+        self.assertRaises(pyrabbit2.api.APIError, self.client.is_alive, 'nope')
+
+    def test_call_401_raises_permission_error(self):
+        err = pyrabbit2.http.HTTPError(None, 401, 'Unauthorized', 'users')
+        self.client.http.do_call = Mock(side_effect=err)
+        self.assertRaises(pyrabbit2.api.PermissionError, self.client.get_users)
 
     def test_get_vhosts_200(self):
         self.client.http.do_call = Mock(return_value=[])
@@ -54,6 +82,20 @@ class TestClient(unittest.TestCase):
         self.client.http.do_call = Mock(return_value=True)
         self.assertTrue(self.client.purge_queues(['q1', 'q2']))
 
+    def test_purge_queues_concurrently(self):
+        self.client.http.do_call = Mock(return_value=204)
+        queues = [('q%d' % i, '/') for i in range(20)]
+        self.assertTrue(self.client.purge_queues(queues, max_workers=4))
+        paths = sorted(c[0][0] for c in self.client.http.do_call.call_args_list)
+        self.assertEqual(paths, sorted('queues/%%2F/q%d/contents' % i
+                                       for i in range(20)))
+
+    def test_iter_queues(self):
+        self.client.http.iter_items = Mock(return_value=iter([{'name': 'q1'}]))
+        queues = list(self.client.iter_queues('/'))
+        self.assertEqual(queues, [{'name': 'q1'}])
+        self.client.http.iter_items.assert_called_with('queues/%2F', None)
+
     def test_get_queue(self):
         self.client.http.do_call = Mock(return_value=True)
         self.assertTrue(self.client.get_queue('', 'q1'))
@@ -98,7 +140,7 @@ class TestClient(unittest.TestCase):
         q = {'messages': 8}
         json_q = json.dumps(q)
 
-        with patch('requests.request') as req:
+        with patch('requests.Session.request') as req:
             resp = requests.Response()
             resp._content = json_q.encode()
             resp.status_code = 200
@@ -174,6 +216,15 @@ class TestClient(unittest.TestCase):
         self.client.http.do_call = Mock(return_value=True)
         self.assertTrue(self.client.delete_user('user'))
 
+    def test_user_paths_quote_username(self):
+        self.client.http.do_call = Mock(return_value=True)
+        self.client.delete_user('a/b')
+        self.assertEqual(self.client.http.do_call.call_args[0][0],
+                         'users/a%2Fb')
+        self.client.get_user_permissions('a b')
+        self.assertEqual(self.client.http.do_call.call_args[0][0],
+                         'users/a%20b/permissions')
+
     def test_get_permissions(self):
         self.client.http.do_call = Mock(return_value=True)
         self.assertTrue(self.client.get_permissions())
@@ -195,8 +246,8 @@ class TestClient(unittest.TestCase):
         self.assertTrue(self.client.get_permission('vname', 'username'))
 
     def test_is_alive(self):
-        with patch('pyrabbit2.http.HTTPClient.do_call') as do_call:
-            do_call.return_value = {'status': 'ok'}
+        with patch('pyrabbit2.http.HTTPClient.do_call_status') as do_call:
+            do_call.return_value = 200
             self.assertTrue(self.client.is_alive())
 
     def test_definitions(self):